@@ -3,12 +3,14 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 import uvicorn
+import asyncio
 import os
 from dotenv import load_dotenv
 
 from gemini_client import GeminiClient
 from code_analyzer import CodeAnalyzer
 from models import AnalysisRequest, AnalysisResponse, ChatRequest, ChatResponse
+from review_index import ReviewIndex, ReviewIndexStore
 
 load_dotenv()
 
@@ -38,6 +40,11 @@ code_analyzer = CodeAnalyzer(gemini_client)
 # In-memory storage (replace with Redis/DB in production)
 analysis_cache = {}
 chat_sessions = {}
+review_indexes = ReviewIndexStore(
+    max_reviews=int(os.getenv("REVIEW_INDEX_MAX_REVIEWS", 100)),
+    max_chunks=int(os.getenv("REVIEW_INDEX_MAX_CHUNKS", 50000))
+)
+chat_context_top_k = int(os.getenv("CHAT_CONTEXT_TOP_K", 6))
 
 
 @app.get("/")
@@ -70,7 +77,10 @@ async def analyze_code(request: AnalysisRequest, background_tasks: BackgroundTas
         # Check cache (optional optimization)
         cache_key = f"{request.language}_{hash(str(request.files))}"
         if cache_key in analysis_cache:
-            return analysis_cache[cache_key]
+            result = analysis_cache[cache_key]
+            if request.review_id and request.review_id not in review_indexes:
+                background_tasks.add_task(_index_review, request, result)
+            return result
         
         # Perform analysis
         print(f"Analyzing {len(request.files)} files in {request.language}...")
@@ -84,6 +94,10 @@ async def analyze_code(request: AnalysisRequest, background_tasks: BackgroundTas
         # Cache result
         analysis_cache[cache_key] = result
         
+        # Index code and issues so chat only sends relevant chunks
+        if request.review_id:
+            background_tasks.add_task(_index_review, request, result)
+        
         return result
         
     except Exception as e:
@@ -91,6 +105,29 @@ async def analyze_code(request: AnalysisRequest, background_tasks: BackgroundTas
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+async def _index_review(request: AnalysisRequest, result: AnalysisResponse):
+    """
+    Build and store the retrieval index for a completed review
+
+    Runs as a background task in a worker thread so large reviews don't
+    block the event loop. Failures are logged; chat then falls back to
+    the context sent by the backend.
+    """
+    try:
+        index = await asyncio.to_thread(
+            ReviewIndex.build,
+            files=request.files,
+            issues=result.issues,
+            language=request.language,
+            architecture_analysis=result.architecture_analysis,
+            summary=result.summary
+        )
+        review_indexes.put(request.review_id, index)
+        print(f"Indexed review {request.review_id}: {len(index.chunks)} chunks")
+    except Exception as e:
+        print(f"Indexing error for review {request.review_id}: {str(e)}")
+
+
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
     """
@@ -110,11 +147,19 @@ async def chat(request: ChatRequest):
         # Get conversation history
         history = chat_sessions[request.review_id]
         
+        # Narrow context to the chunks relevant to this message. Without a
+        # stored index (restart, eviction), rank the backend's context per
+        # turn instead of storing it, since it may change between turns.
+        index = review_indexes.get(request.review_id)
+        if index is None and request.context:
+            index = ReviewIndex.from_text(request.context)
+        context = index.build_context(request.message, chat_context_top_k) if index else None
+        
         # Get response from Gemini 3
         response = await gemini_client.chat(
             message=request.message,
             history=history,
-            context=request.context
+            context=context
         )
         
         # Update history
@@ -156,6 +201,7 @@ async def clear_cache():
     global analysis_cache, chat_sessions
     analysis_cache.clear()
     chat_sessions.clear()
+    review_indexes.clear()
     return {"message": "Cache cleared"}
 
 
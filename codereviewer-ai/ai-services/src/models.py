@@ -28,6 +28,7 @@ class AnalysisRequest(BaseModel):
     files: List[CodeFile]
     language: str
     focus_areas: Optional[List[str]] = None
+    review_id: Optional[str] = None  # Enables a retrieval index for chat
 
 
 class AnalysisResponse(BaseModel):
@@ -0,0 +1,283 @@
+import math
+import re
+from functools import lru_cache
+from collections import Counter, OrderedDict, defaultdict
+from typing import List, Dict, Optional
+from models import CodeFile, Issue
+
+
+class IndexChunk:
+    """A retrievable unit of review context (code window or issue)"""
+
+    def __init__(self, kind: str, text: str, header: str, severity: str = ""):
+        self.kind = kind  # issue, context, code, architecture
+        self.text = text
+        self.header = header
+        self.severity = severity
+
+
+SEVERITY_RANK = {"critical": 0, "high": 1, "medium": 2, "low": 3}
+
+
+class ReviewIndex:
+    """BM25 index over code chunks and issues of a single review"""
+
+    def __init__(
+        self,
+        chunks: List[IndexChunk],
+        summary: Optional[Dict] = None,
+        k1: float = 1.5,
+        b: float = 0.75
+    ):
+        self.chunks = chunks
+        self.summary = summary
+        self.k1 = k1
+        self.b = b
+
+        # Inverted index: term -> [(chunk index, term frequency)]
+        self._postings: Dict[str, List[tuple]] = defaultdict(list)
+        self._lengths = []
+        for i, chunk in enumerate(chunks):
+            term_freqs = Counter(tokenize(chunk.header + "\n" + chunk.text))
+            self._lengths.append(sum(term_freqs.values()))
+            for term, freq in term_freqs.items():
+                self._postings[term].append((i, freq))
+        self._postings = dict(self._postings)
+        self._avg_length = (sum(self._lengths) / len(chunks)) if chunks else 0.0
+
+        n = len(chunks)
+        self._idf = {
+            term: math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    @classmethod
+    def build(
+        cls,
+        files: List[CodeFile],
+        issues: List[Issue],
+        language: str,
+        architecture_analysis: str = "",
+        summary: Optional[Dict] = None,
+        chunk_lines: int = 40,
+        overlap: int = 10
+    ) -> "ReviewIndex":
+        """
+        Build an index from reviewed files and parsed issues
+
+        Args:
+            files: Code files that were analyzed
+            issues: Issues parsed from the analysis
+            language: Programming language (used for code fences)
+            architecture_analysis: Free-text architecture review
+            summary: Issue counts by severity and type
+            chunk_lines: Lines per code chunk
+            overlap: Lines shared between consecutive code chunks
+
+        Returns:
+            Index ready for querying
+        """
+        chunks = []
+
+        for issue in issues:
+            chunks.append(IndexChunk(
+                kind="issue",
+                severity=issue.severity.lower(),
+                header=f"[{issue.severity}] {issue.type} issue: {issue.title} ({issue.file}, line {issue.line})",
+                text=(
+                    f"Description: {issue.description}\n"
+                    f"Suggestion: {issue.suggestion}\n"
+                    f"Reasoning: {issue.reasoning}"
+                    + (f"\nCode:\n{issue.code_snippet}" if issue.code_snippet else "")
+                )
+            ))
+
+        step = max(1, chunk_lines - overlap)
+        for file in files:
+            lines = file.content.split('\n')
+            fence = file.language or language
+            for start in range(0, len(lines), step):
+                window = lines[start:start + chunk_lines]
+                if not any(line.strip() for line in window):
+                    continue
+                end = start + len(window)
+                chunks.append(IndexChunk(
+                    kind="code",
+                    header=f"File: {file.path} (lines {start + 1}-{end})",
+                    text=f"```{fence}\n" + "\n".join(window) + "\n```"
+                ))
+                if end >= len(lines):
+                    break
+
+        for paragraph in architecture_analysis.split("\n\n"):
+            if paragraph.strip():
+                chunks.append(IndexChunk(
+                    kind="architecture",
+                    header="Architecture analysis",
+                    text=paragraph.strip()
+                ))
+
+        return cls(chunks, summary=summary)
+
+    @classmethod
+    def from_text(cls, text: str) -> "ReviewIndex":
+        """Build an index from a free-text context, one chunk per paragraph"""
+        chunks = [
+            IndexChunk(kind="context", header="Context", text=paragraph.strip())
+            for paragraph in text.split("\n\n")
+            if paragraph.strip()
+        ]
+        return cls(chunks)
+
+    def search(self, query: str, top_k: int = 5) -> List[IndexChunk]:
+        """
+        Rank chunks against a query with BM25
+
+        Args:
+            query: User's message
+            top_k: Maximum number of chunks to return
+
+        Returns:
+            Matching chunks, best first
+        """
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for i, freq in self._postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[i] / (self._avg_length or 1))
+                scores[i] += idf * freq * (self.k1 + 1) / (freq + norm)
+
+        ranked = sorted(scores.items(), key=lambda s: (-s[1], s[0]))
+        return [self.chunks[i] for i, _ in ranked[:top_k]]
+
+    def build_context(self, query: str, top_k: int = 5, header_issues: int = 3) -> str:
+        """
+        Render chat context for a query
+
+        Always opens with the review summary and the highest-severity
+        issues, so broad questions ("what should I fix first?") keep the
+        findings even when the query words match code better. The top_k
+        BM25 hits follow, issues before code; when nothing matches, the
+        remaining chunks are used in severity order.
+        """
+        issues = sorted(
+            (c for c in self.chunks if c.kind == "issue"),
+            key=lambda c: SEVERITY_RANK.get(c.severity, 4)
+        )
+        pinned = issues[:header_issues]
+        pinned_ids = {id(c) for c in pinned}
+
+        hits = [c for c in self.search(query, top_k + len(pinned)) if id(c) not in pinned_ids][:top_k]
+        if not hits:
+            rest = [c for c in self.chunks if id(c) not in pinned_ids]
+            hits = sorted(rest, key=lambda c: SEVERITY_RANK.get(c.severity, 4))[:top_k]
+
+        order = {"issue": 0, "context": 1, "code": 2, "architecture": 3}
+        hits = sorted(hits, key=lambda c: order.get(c.kind, 4))
+
+        parts = []
+        if self.summary:
+            parts.append(f"Review summary: {format_summary(self.summary)}")
+        parts.extend(f"{c.header}\n{c.text}" for c in pinned + hits)
+        return "\n\n".join(parts)
+
+
+def format_summary(summary: Dict) -> str:
+    """Render the analyzer's summary dict as one line"""
+    severities = ", ".join(
+        f"{severity}: {summary.get(severity, 0)}" for severity in SEVERITY_RANK
+    )
+    by_type = ", ".join(f"{t}: {n}" for t, n in summary.get("by_type", {}).items())
+    line = f"{summary.get('total', 0)} issues ({severities})"
+    return f"{line}; by type: {by_type}" if by_type else line
+
+
+class ReviewIndexStore:
+    """
+    LRU store of per-review indexes, bounded by review count and total chunks
+
+    The chunk bound caps memory regardless of repository size; the most
+    recently stored index is always kept even if it alone exceeds it.
+    """
+
+    def __init__(self, max_reviews: int = 100, max_chunks: int = 50000):
+        self.max_reviews = max_reviews
+        self.max_chunks = max_chunks
+        self._indexes: "OrderedDict[str, ReviewIndex]" = OrderedDict()
+        self._total_chunks = 0
+
+    def get(self, review_id: str) -> Optional[ReviewIndex]:
+        index = self._indexes.get(review_id)
+        if index is not None:
+            self._indexes.move_to_end(review_id)
+        return index
+
+    def put(self, review_id: str, index: ReviewIndex):
+        previous = self._indexes.pop(review_id, None)
+        if previous is not None:
+            self._total_chunks -= len(previous.chunks)
+        self._indexes[review_id] = index
+        self._total_chunks += len(index.chunks)
+        while len(self._indexes) > 1 and (
+            len(self._indexes) > self.max_reviews or self._total_chunks > self.max_chunks
+        ):
+            evicted, evicted_index = self._indexes.popitem(last=False)
+            self._total_chunks -= len(evicted_index.chunks)
+            print(f"Evicted review index: {evicted}")
+
+    def clear(self):
+        self._indexes.clear()
+        self._total_chunks = 0
+
+    def __contains__(self, review_id: str) -> bool:
+        return review_id in self._indexes
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9_]+")
+_CAMEL_PATTERN = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+# Common English words that would otherwise match nearly every chunk
+STOP_WORDS = frozenset("""
+a about an and are as at be but by can could do does did explain for from had has
+have how i if in into is it its me more my no not of on or please should so tell
+than that the their them then there these they this to was we what when where which
+who why will with would you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase word tokens for indexing and queries
+
+    camelCase and snake_case identifiers are emitted whole and as parts,
+    stop words are dropped and plurals reduced ("issues" -> "issue").
+    """
+    tokens = []
+    for word in _TOKEN_PATTERN.findall(text):
+        tokens.extend(_word_tokens(word))
+    return tokens
+
+
+@lru_cache(maxsize=65536)
+def _word_tokens(word: str) -> tuple:
+    """Tokens for a single word; cached since code repeats identifiers heavily"""
+    word = word.strip("_")
+    if not word:
+        return ()
+    tokens = [word.lower()]
+    parts = [p for piece in word.split("_") for p in _CAMEL_PATTERN.findall(piece)]
+    if len(parts) > 1:
+        tokens.extend(p.lower() for p in parts)
+    return tuple(_stem(t) for t in tokens if t not in STOP_WORDS)
+
+
+def _stem(token: str) -> str:
+    """Strip a plural "s" so singular and plural forms match"""
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Service modules use flat imports (e.g. `from models import Issue`)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
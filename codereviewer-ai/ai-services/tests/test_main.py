@@ -0,0 +1,117 @@
+import pytest
+from fastapi.testclient import TestClient
+
+ANALYSIS_TEXT = """---ISSUE---
+Type: security
+Severity: critical
+File: app.py
+Line: 2
+Title: SQL injection in login
+Description: Query built from user input
+Suggestion: Use parameters
+Reasoning: Attackers control the query
+---END---
+"""
+
+
+class StubGeminiClient:
+    """Records chat calls instead of hitting the Gemini API"""
+
+    def __init__(self):
+        self.chat_calls = []
+        self.generate_calls = 0
+
+    async def generate_content(self, prompt, temperature=0.4, max_tokens=4096):
+        self.generate_calls += 1
+        return ANALYSIS_TEXT
+
+    async def chat(self, message, history=None, context=None):
+        self.chat_calls.append({"message": message, "context": context})
+        return "stub answer"
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    import main
+
+    stub = StubGeminiClient()
+    monkeypatch.setattr(main, "gemini_client", stub)
+    monkeypatch.setattr(main.code_analyzer, "gemini", stub)
+    main.analysis_cache.clear()
+    main.chat_sessions.clear()
+    main.review_indexes.clear()
+    return main, stub, TestClient(main.app)
+
+
+def analyze(client, review_id, content="def login(user):\n    db.execute(user)\n"):
+    return client.post("/api/analyze", json={
+        "files": [{"path": "app.py", "content": content}],
+        "language": "python",
+        "review_id": review_id
+    })
+
+
+def test_analyze_indexes_review(app):
+    main, stub, client = app
+    response = analyze(client, "r1")
+    assert response.status_code == 200
+    assert "r1" in main.review_indexes
+
+
+def test_chat_uses_stored_index_instead_of_request_context(app):
+    main, stub, client = app
+    analyze(client, "r1")
+    client.post("/api/chat", json={
+        "review_id": "r1",
+        "message": "is login safe?",
+        "context": "backend context"
+    })
+    context = stub.chat_calls[-1]["context"]
+    assert "backend context" not in context
+    assert "SQL injection in login" in context
+    assert "db.execute" in context
+
+
+def test_chat_without_index_ranks_request_context(app):
+    main, stub, client = app
+    client.post("/api/chat", json={
+        "review_id": "r2",
+        "message": "anything about tokens?",
+        "context": "Issue: Weak token\nFile: auth.py\n\nIssue: Unused import\nFile: app.py"
+    })
+    context = stub.chat_calls[-1]["context"]
+    assert context.startswith("Context\nIssue: Weak token")
+    assert "r2" not in main.review_indexes
+
+
+def test_cache_hit_indexes_new_review_once(app, monkeypatch):
+    main, stub, client = app
+    analyze(client, "r1")
+    assert stub.generate_calls == 2
+
+    builds = []
+    original_build = main.ReviewIndex.build
+    monkeypatch.setattr(main.ReviewIndex, "build",
+                        lambda **kwargs: builds.append(1) or original_build(**kwargs))
+
+    analyze(client, "r2")
+    assert stub.generate_calls == 2
+    assert "r2" in main.review_indexes
+    assert len(builds) == 1
+
+    analyze(client, "r2")
+    assert len(builds) == 1
+
+
+def test_indexing_failure_still_returns_analysis(app, monkeypatch):
+    main, stub, client = app
+
+    def fail(**kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(main.ReviewIndex, "build", fail)
+    response = analyze(client, "r1")
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    assert "r1" not in main.review_indexes
@@ -0,0 +1,169 @@
+from models import CodeFile, Issue
+from review_index import ReviewIndex, ReviewIndexStore, tokenize
+
+
+def make_issue(
+    issue_id: str,
+    severity: str,
+    title: str,
+    description: str = "",
+    line: int = 1,
+    code_snippet: str = ""
+) -> Issue:
+    return Issue(
+        id=issue_id,
+        type="security",
+        severity=severity,
+        file="app.py",
+        line=line,
+        title=title,
+        description=description,
+        suggestion="",
+        reasoning="",
+        code_snippet=code_snippet
+    )
+
+
+def test_tokenize_splits_identifiers_and_drops_stop_words():
+    tokens = tokenize("What is getUserPassword doing in user_repo?")
+    assert "getuserpassword" in tokens
+    assert "user_repo" in tokens
+    assert {"get", "user", "password", "repo"} <= set(tokens)
+    assert "what" not in tokens
+    assert "is" not in tokens
+
+
+def test_tokenize_reduces_plurals():
+    assert tokenize("issues problems class") == ["issue", "problem", "class"]
+
+
+def test_code_chunks_overlap_and_stop_at_end_of_file():
+    content = "\n".join(f"line{i}" for i in range(1, 61))
+    index = ReviewIndex.build(
+        files=[CodeFile(path="app.py", content=content)],
+        issues=[],
+        language="python",
+        chunk_lines=40,
+        overlap=10
+    )
+    headers = [c.header for c in index.chunks]
+    assert headers == [
+        "File: app.py (lines 1-40)",
+        "File: app.py (lines 31-60)",
+    ]
+
+
+def test_search_ranks_matching_issue_first():
+    index = ReviewIndex.build(
+        files=[CodeFile(path="app.py", content="def render(page):\n    return page.html")],
+        issues=[
+            make_issue("issue_0", "low", "Inconsistent naming"),
+            make_issue("issue_1", "high", "SQL injection in login", "Query built from user input"),
+        ],
+        language="python"
+    )
+    hits = index.search("is the login query safe from sql injection?", top_k=2)
+    assert hits[0].header.startswith("[high] security issue: SQL injection in login")
+
+
+def test_issue_matches_quoted_flagged_code():
+    index = ReviewIndex.build(
+        files=[],
+        issues=[
+            make_issue("issue_0", "low", "Naming"),
+            make_issue("issue_1", "medium", "Unsafe call", code_snippet="pickle.loads(payload)"),
+        ],
+        language="python"
+    )
+    hits = index.search("is pickle.loads ok here?", top_k=1)
+    assert hits[0].header.startswith("[medium] security issue: Unsafe call")
+
+
+def test_stop_words_alone_do_not_match():
+    index = ReviewIndex.build(
+        files=[CodeFile(path="app.py", content="# what is the point of this")],
+        issues=[],
+        language="python"
+    )
+    assert index.search("what is the point?") != []
+    assert index.search("what is this?") == []
+
+
+def test_fallback_orders_issues_by_severity():
+    index = ReviewIndex.build(
+        files=[],
+        issues=[
+            make_issue("issue_0", "low", "Naming"),
+            make_issue("issue_1", "critical", "Hardcoded secret"),
+            make_issue("issue_2", "medium", "Missing timeout"),
+        ],
+        language="python"
+    )
+    context = index.build_context("summarize please", top_k=1, header_issues=1)
+    assert context.startswith("[critical]")
+    assert "Missing timeout" in context
+    assert "Naming" not in context
+
+
+def test_broad_questions_keep_findings_when_code_vocabulary_overlaps():
+    code = "\n".join(
+        ["def fix_issues(all_items):", "    first = all_items[0]", "    return first"] * 30
+    )
+    issues = [
+        make_issue("issue_0", "high", "Missing input validation"),
+        make_issue("issue_1", "critical", "Hardcoded secret"),
+    ]
+    index = ReviewIndex.build(
+        files=[CodeFile(path="app.py", content=code)],
+        issues=issues,
+        language="python",
+        summary={"total": 2, "critical": 1, "high": 1, "medium": 0, "low": 0,
+                 "by_type": {"security": 2}}
+    )
+    for query in ["what are all the issues?", "which problems should I fix first?"]:
+        context = index.build_context(query, top_k=3)
+        assert "Hardcoded secret" in context
+        assert "Missing input validation" in context
+        assert context.index("Hardcoded secret") < context.index("Missing input validation")
+
+    context = index.build_context("how many critical issues are there?", top_k=3)
+    assert context.startswith("Review summary: 2 issues (critical: 1, high: 1, medium: 0, low: 0)")
+
+
+def test_fallback_never_returns_empty_context_for_text_index():
+    index = ReviewIndex.from_text(
+        "Issue: SQL injection\nFile: db.py, Line: 4\n\n"
+        "Issue: Unused import\nFile: app.py, Line: 1"
+    )
+    for query in ["Summarize please", "how many problems?", "explain more"]:
+        context = index.build_context(query, top_k=5)
+        assert "SQL injection" in context
+        assert "Unused import" in context
+
+
+def test_store_evicts_least_recently_used():
+    store = ReviewIndexStore(max_reviews=2)
+    index = ReviewIndex.from_text("one")
+    store.put("a", index)
+    store.put("b", index)
+    store.get("a")
+    store.put("c", index)
+    assert "a" in store
+    assert "b" not in store
+    assert len(store) == 2
+
+
+def test_store_is_bounded_by_total_chunks():
+    store = ReviewIndexStore(max_reviews=10, max_chunks=4)
+    store.put("a", ReviewIndex.from_text("x\n\ny"))
+    store.put("b", ReviewIndex.from_text("x\n\ny"))
+    store.put("c", ReviewIndex.from_text("x\n\ny\n\nz"))
+    assert "a" not in store
+    assert "b" not in store
+    assert "c" in store
+
+    # A single oversized index is kept rather than dropped outright
+    store.put("d", ReviewIndex.from_text("\n\n".join("p" * i for i in range(1, 8))))
+    assert "c" not in store
+    assert "d" in store
+    assert len(store) == 1
@@ -62,7 +62,8 @@ public class ReviewController : ControllerBase
                     // Call AI service
                     var analysisResult = await _aiClient.AnalyzeCodeAsync(
                         request.Files,
-                        request.Language
+                        request.Language,
+                        review.Id.ToString()
                     );
 
                     // Save results
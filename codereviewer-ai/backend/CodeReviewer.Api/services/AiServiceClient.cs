@@ -6,7 +6,7 @@ namespace CodeReviewer.Api.Services;
 
 public interface IAiServiceClient
 {
-    Task<dynamic> AnalyzeCodeAsync(List<CodeFileDto> files, string language);
+    Task<dynamic> AnalyzeCodeAsync(List<CodeFileDto> files, string language, string? reviewId = null);
     Task<string> ChatAsync(string reviewId, string message, string? context = null);
 }
 
@@ -21,7 +21,7 @@ public class AiServiceClient : IAiServiceClient
         _logger = logger;
     }
 
-    public async Task<dynamic> AnalyzeCodeAsync(List<CodeFileDto> files, string language)
+    public async Task<dynamic> AnalyzeCodeAsync(List<CodeFileDto> files, string language, string? reviewId = null)
     {
         try
         {
@@ -34,7 +34,8 @@ public class AiServiceClient : IAiServiceClient
                     language = f.Language ?? language
                 }).ToList(),
                 language,
-                focus_areas = new[] { "security", "performance", "quality", "architecture" }
+                focus_areas = new[] { "security", "performance", "quality", "architecture" },
+                review_id = reviewId
             };
 
             var json = JsonSerializer.Serialize(request);